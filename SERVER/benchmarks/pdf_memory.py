@@ -0,0 +1,88 @@
+# SERVER/benchmarks/pdf_memory.py
+"""
+Compare peak Python memory of the buffered PDF path (bytes + base64, as used in
+the JSON response) against the streaming path (temp file + chunks).
+
+Note: pages are not rendered incrementally in either path. ReportLab builds the
+whole PDF as one bytes object before writing it, so the streaming path only
+avoids the extra getvalue()/base64 copies; its peak is still about 1x the PDF.
+
+Run from SERVER/:
+    python -m benchmarks.pdf_memory --pages 100
+"""
+import argparse
+import base64
+import time
+import tracemalloc
+
+import fitz  # PyMuPDF, only used to count the pages actually rendered
+
+from services.pdf_builder import build_ai_pdf, build_ai_pdf_file, iter_file
+
+# Roughly how many summary lines / flashcards fill one letter page (the real
+# page count is measured and printed, since this is only an estimate)
+_LINES_PER_PAGE = 30
+_CARDS_PER_PAGE = 8
+
+
+def _make_content(pages: int):
+    half = max(1, pages // 2)
+    lines = []
+    for i in range(half * _LINES_PER_PAGE):
+        if i % 15 == 0:
+            lines.append(f"### Topic {i // 15 + 1}")
+        elif i % 3 == 0:
+            lines.append(f"* **Point {i}:** bullet text about the topic with some detail.")
+        else:
+            lines.append(f"Paragraph line {i} with enough words to wrap across the page width once or twice.")
+    summary = "\n".join(lines)
+    flashcards = [
+        {"question": f"Question {n}: what does concept {n} mean?",
+         "answer": f"Answer {n}: concept {n} is explained in **detail** here."}
+        for n in range(1, half * _CARDS_PER_PAGE + 1)
+    ]
+    return summary, flashcards
+
+
+def _buffered(summary, flashcards):
+    pdf_bytes = build_ai_pdf(summary, flashcards)
+    encoded = base64.b64encode(pdf_bytes).decode("utf-8")
+    return len(pdf_bytes), len(encoded)
+
+
+def _streamed(summary, flashcards):
+    total = 0
+    for chunk in iter_file(build_ai_pdf_file(summary, flashcards)):
+        total += len(chunk)
+    return total, total
+
+
+def _measure(fn, summary, flashcards):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    size, sent = fn(summary, flashcards)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, sent, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100, help="approximate output length in pages")
+    args = parser.parse_args()
+
+    summary, flashcards = _make_content(args.pages)
+    with fitz.open(stream=build_ai_pdf(summary, flashcards), filetype="pdf") as doc:
+        print(f"rendered pages: {doc.page_count} (requested ~{args.pages})")
+
+    for name, fn in (("buffered+base64", _buffered), ("streamed", _streamed)):
+        size, sent, peak, elapsed = _measure(fn, summary, flashcards)
+        print(
+            f"{name:>16}: pdf={size / 1024:.0f} KiB sent={sent / 1024:.0f} KiB "
+            f"peak={peak / (1024 * 1024):.1f} MiB time={elapsed:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
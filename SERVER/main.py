@@ -8,6 +8,10 @@ from dotenv import load_dotenv
 # Routers
 from routes import auth as auth_routes
 from routes import upload as upload_routes
+from routes import health as health_routes
+from services import health
+from services.executors import shutdown_gemini_executor
+from services.file_parser import shutdown_ocr_pool
 
 # Firebase admin (safe init)
 import firebase_admin
@@ -90,18 +94,30 @@ def _init_firebase_admin_from_env_or_path():
     except Exception as e:
         logger.exception("Failed to initialize Firebase Admin from FIREBASE_SERVICE_ACCOUNT: %s", e)
 
-# Initialize Firebase Admin SDK on startup (safe: will skip if already initialized)
+# Start the event-loop lag probe and initialize Firebase Admin SDK on startup (safe: will skip if already initialized)
 @app.on_event("startup")
-def on_startup():
+async def on_startup():
+    health.start_loop_lag_monitor()
     try:
         _init_firebase_admin_from_env_or_path()
     except Exception as e:
         # Log exception; if Firebase is required for your app to function you may want to raise instead.
         logger.exception("Failed to initialize Firebase Admin on startup: %s", e)
 
-# Include routers (auth + upload)
+@app.on_event("shutdown")
+async def on_shutdown():
+    health.stop_loop_lag_monitor()
+    shutdown_gemini_executor()
+
+# Stop the OCR worker processes / PDF parse threads (recreated lazily on next use)
+@app.on_event("shutdown")
+def on_shutdown_ocr():
+    shutdown_ocr_pool()
+
+# Include routers (auth + upload + health probes)
 app.include_router(auth_routes.router)
 app.include_router(upload_routes.router)
+app.include_router(health_routes.router)
 
 @app.get("/")
 def root():
@@ -0,0 +1,32 @@
+# SERVER/routes/health.py
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from services import health
+
+router = APIRouter(tags=["health"])
+
+
+# Also served under /api/ because the Vercel config only routes /api/* to the server
+@router.get("/healthz")
+@router.get("/api/healthz")
+async def healthz():
+    """
+    Liveness: the process is up and serving. Always 200; load signals are
+    included for dashboards but do not affect the status code.
+    Both probes are async so they run on the serving loop rather than
+    queueing behind a busy threadpool.
+    """
+    return {"status": "ok", **health.snapshot()}
+
+
+@router.get("/readyz")
+@router.get("/api/readyz")
+async def readyz():
+    """
+    Readiness: 503 when any load signal (event loop lag, in-flight pipelines,
+    executor queue depth, recent Gemini error rate) is above its threshold,
+    so the load balancer stops sending new uploads here.
+    """
+    snap = health.snapshot()
+    return JSONResponse(status_code=200 if snap["ready"] else 503, content=snap)
@@ -4,11 +4,14 @@ import base64
 import logging
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 
 from services.file_parser import extract_text
 from services.gemini_service import generate_summary_and_flashcards
-from services.pdf_builder import build_ai_pdf
+from services.pdf_builder import build_ai_pdf, build_ai_pdf_file, iter_file
+from services.health import track_pipeline
+from services.executors import run_in_gemini_executor
 
 router = APIRouter(prefix="/api/gemini", tags=["gemini"])
 
@@ -19,13 +22,26 @@ logger = logging.getLogger(__name__)
 async def upload_file(
     file: UploadFile = File(...),
     return_pdf: bool = True,
+    stream_pdf: bool = False,
 ):
     """
     Upload study file (PDF/DOCX), send to Gemini, return AI output.
     This endpoint is intentionally PUBLIC (no authentication).
     If return_pdf=True (default) we include base64-encoded PDF in the JSON.
+    If stream_pdf=True the rendered PDF itself is streamed back (application/pdf)
+    instead of JSON, which avoids the in-memory/base64 copies for large outputs.
+    Streaming mode returns the PDF only (no summary/flashcards JSON) and requires
+    return_pdf=True; stream_pdf=True with return_pdf=False is rejected with 400.
     """
+    if stream_pdf and not return_pdf:
+        raise HTTPException(status_code=400, detail="stream_pdf=true requires return_pdf=true.")
 
+    # Counted as in-flight for /readyz until the response is ready to send
+    with track_pipeline():
+        return await _run_pipeline(file, return_pdf, stream_pdf)
+
+
+async def _run_pipeline(file: UploadFile, return_pdf: bool, stream_pdf: bool):
     # Validate file size (max 10MB)
     contents = await file.read()
     if len(contents) > 10 * 1024 * 1024:
@@ -46,11 +62,29 @@ async def upload_file(
 
     # Call Gemini service
     try:
-        summary, flashcards = generate_summary_and_flashcards(text)
+        # Blocking network call; run it off the event loop so other requests (and probes) keep moving
+        summary, flashcards = await run_in_gemini_executor(generate_summary_and_flashcards, text)
     except Exception as e:
         logger.exception("Gemini service failed while generating content")
         raise HTTPException(status_code=502, detail=f"AI generation failed: {e}") from e
 
+    # PDF rendering is CPU bound (seconds for long outputs); keep it off the event loop too.
+    # It shares the Gemini executor so /readyz sees the whole post-parse backlog.
+    if stream_pdf:
+        try:
+            pdf_file = await run_in_gemini_executor(build_ai_pdf_file, summary, flashcards)
+        except Exception as e:
+            logger.exception("Failed to build PDF from AI results")
+            raise HTTPException(status_code=500, detail=f"Failed to build PDF: {e}") from e
+        # iter_file closes the temp file when done; the background task also covers
+        # a client that disconnects before streaming starts
+        return StreamingResponse(
+            iter_file(pdf_file),
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="ThinkNotes_Response.pdf"'},
+            background=BackgroundTask(pdf_file.close),
+        )
+
     data = {
         "summary": summary,
         "flashcards": flashcards,
@@ -58,7 +92,7 @@ async def upload_file(
 
     if return_pdf:
         try:
-            pdf_bytes = build_ai_pdf(summary, flashcards)
+            pdf_bytes = await run_in_gemini_executor(build_ai_pdf, summary, flashcards)
             data["pdf_b64"] = base64.b64encode(pdf_bytes).decode("utf-8")
         except Exception as e:
             logger.exception("Failed to build PDF from AI results")
@@ -0,0 +1,83 @@
+# SERVER/services/executors.py
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+# Threads for the blocking Gemini calls and PDF rendering in the upload pipeline
+GEMINI_MAX_WORKERS = int(os.getenv("GEMINI_MAX_WORKERS", "8"))
+
+_gemini_executor = None
+_gemini_executor_lock = Lock()
+
+
+class QueueCounter:
+    """Thread-safe count of work submitted to an executor but not finished/started yet."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return self._count
+
+    def add(self, n: int = 1):
+        with self._lock:
+            self._count += n
+
+    async def run_in_executor(self, executor, fn, *args):
+        """
+        loop.run_in_executor, counting the call as queued until it starts running
+        (or is cancelled before it gets a thread).
+        """
+        queued = [True]
+
+        def _leave():
+            with self._lock:
+                if queued[0]:
+                    queued[0] = False
+                    self._count -= 1
+
+        def _call():
+            _leave()
+            return fn(*args)
+
+        self.add(1)
+        try:
+            fut = asyncio.get_running_loop().run_in_executor(executor, _call)
+        except Exception:
+            _leave()
+            raise
+        fut.add_done_callback(lambda _: _leave())
+        return await fut
+
+
+_gemini_queue = QueueCounter()
+
+
+def _get_gemini_executor() -> ThreadPoolExecutor:
+    global _gemini_executor
+    with _gemini_executor_lock:
+        if _gemini_executor is None:
+            _gemini_executor = ThreadPoolExecutor(max_workers=GEMINI_MAX_WORKERS, thread_name_prefix="gemini")
+        return _gemini_executor
+
+
+async def run_in_gemini_executor(fn, *args):
+    return await _gemini_queue.run_in_executor(_get_gemini_executor(), fn, *args)
+
+
+def gemini_queue_depth() -> int:
+    """Gemini/render calls waiting for a free thread."""
+    return _gemini_queue.count
+
+
+def shutdown_gemini_executor():
+    """Stop the Gemini threads (called on app shutdown); recreated on next use."""
+    global _gemini_executor
+    with _gemini_executor_lock:
+        executor, _gemini_executor = _gemini_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
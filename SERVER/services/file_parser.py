@@ -1,11 +1,59 @@
 import os
+import time
+import hashlib
+import logging
 import tempfile
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
 from fastapi import UploadFile
 import fitz  # PyMuPDF
 import docx
 
+from services.executors import QueueCounter
+
 SUPPORTED_EXTS = {".pdf", ".docx"}   # We'll reject .doc for now (legacy binary)
 
+logger = logging.getLogger(__name__)
+
+# OCR fallback for scanned (image-only) PDF pages. Uses Tesseract through
+# PyMuPDF, so Tesseract language data (tessdata) must be installed on the host.
+OCR_ENABLED = os.getenv("OCR_ENABLED", "true").lower() in ("1", "true", "yes")
+OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "eng")
+OCR_TESSDATA = os.getenv("OCR_TESSDATA") or None  # falls back to TESSDATA_PREFIX / PyMuPDF's lookup
+OCR_DPI = int(os.getenv("OCR_DPI", "200"))
+OCR_TIME_BUDGET_S = float(os.getenv("OCR_TIME_BUDGET_S", "60"))
+OCR_MAX_WORKERS = int(os.getenv("OCR_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+OCR_CACHE_SIZE = int(os.getenv("OCR_CACHE_SIZE", "512"))
+
+# Pages with fewer non-whitespace characters than this are treated as having no text layer
+_MIN_TEXT_CHARS = 5
+# A page is "scanned" when images cover at least this fraction of it...
+_SCAN_MIN_IMAGE_COVERAGE = 0.5
+# ...and the text layer covers less than this fraction of the image area
+# (catches scanner-app watermarks, page numbers and header stamps over a scan)
+_SCAN_MAX_TEXT_TO_IMAGE = 0.1
+
+_ocr_pool = None
+_ocr_pool_lock = Lock()
+_ocr_available = None  # None = not probed yet
+
+
+# (file sha256, page number, dpi, language) -> OCR text
+_ocr_cache = OrderedDict()
+_ocr_cache_lock = Lock()
+
+# Dedicated threads for PDF parsing, so a long OCR wait never ties up the
+# executor the Gemini calls run on. Created lazily like the OCR pool.
+_parse_executor = None
+
+# Queue-depth tracking for /readyz: PDFs waiting for a parse thread, and OCR
+# tasks submitted to the pool and not finished yet (running + queued)
+_parse_queue = QueueCounter()
+_ocr_outstanding = QueueCounter()
+
 
 async def extract_text(file: UploadFile) -> str:
     """
@@ -20,7 +68,8 @@ async def extract_text(file: UploadFile) -> str:
     temp.close()
 
     if suffix == ".pdf":
-        return _extract_text_from_pdf(temp.name)
+        # PDF parsing (and OCR for scanned pages) is CPU bound; keep it off the event loop
+        return await _parse_queue.run_in_executor(_get_parse_executor(), _extract_text_from_pdf, temp.name)
     elif suffix == ".docx":
         return _extract_text_from_docx(temp.name)
     else:
@@ -29,12 +78,243 @@ async def extract_text(file: UploadFile) -> str:
 
 def _extract_text_from_pdf(path: str) -> str:
     text_parts = []
+    scanned_pages = []
     with fitz.open(path) as doc:
         for page in doc:
-            text_parts.append(page.get_text())
+            text = page.get_text()
+            text_parts.append(text)
+            if _needs_ocr(page, text):
+                scanned_pages.append(page.number)
+
+    if scanned_pages and OCR_ENABLED:
+        ocr_text = _ocr_pdf_pages(path, scanned_pages)
+        for pno, text in ocr_text.items():
+            text_parts[pno] = text
+
     return "\n".join(text_parts)
 
 
+def _needs_ocr(page, text: str) -> bool:
+    """
+    A page needs OCR when it contains images but (almost) no text layer, or when
+    an image covers most of the page and the text on it is only a small overlay.
+    Intentionally blank pages (no images) are skipped.
+    """
+    images = page.get_image_info()
+    if not images:
+        return False
+    if len("".join(text.split())) < _MIN_TEXT_CHARS:
+        return True
+
+    image_area = min(sum(_clipped_area(img["bbox"], page.rect) for img in images), _area(page.rect))
+    if image_area < _SCAN_MIN_IMAGE_COVERAGE * _area(page.rect):
+        return False
+
+    text_area = sum(
+        _clipped_area(b[:4], page.rect)
+        for b in page.get_text("blocks")
+        if b[6] == 0 and b[4].strip()
+    )
+    return text_area < _SCAN_MAX_TEXT_TO_IMAGE * image_area
+
+
+def _area(rect) -> float:
+    return max(0.0, rect[2] - rect[0]) * max(0.0, rect[3] - rect[1])
+
+
+def _clipped_area(bbox, page_rect) -> float:
+    return _area((
+        max(bbox[0], page_rect[0]), max(bbox[1], page_rect[1]),
+        min(bbox[2], page_rect[2]), min(bbox[3], page_rect[3]),
+    ))
+
+
+def _ocr_kwargs(dpi: int, language: str, tessdata) -> dict:
+    kwargs = {"dpi": dpi, "full": True, "language": language}
+    if tessdata:
+        kwargs["tessdata"] = tessdata
+    return kwargs
+
+
+def _probe_ocr() -> bool:
+    """OCR a blank page in-process to check Tesseract + tessdata are usable."""
+    try:
+        with fitz.open() as doc:
+            page = doc.new_page(width=72, height=72)
+            page.get_textpage_ocr(**_ocr_kwargs(72, OCR_LANGUAGE, OCR_TESSDATA))
+        return True
+    except Exception as e:
+        logger.warning("Tesseract OCR not available, scanned PDF pages will not be OCR'd: %s", e)
+        return False
+
+
+def _get_parse_executor() -> ThreadPoolExecutor:
+    global _parse_executor
+    with _ocr_pool_lock:
+        if _parse_executor is None:
+            _parse_executor = ThreadPoolExecutor(max_workers=OCR_MAX_WORKERS, thread_name_prefix="pdf-parse")
+        return _parse_executor
+
+
+def _get_ocr_pool():
+    """Return the OCR process pool, or None if OCR is unavailable on this host."""
+    global _ocr_pool, _ocr_available
+    with _ocr_pool_lock:
+        if _ocr_available is None:
+            _ocr_available = _probe_ocr()
+        if not _ocr_available:
+            return None
+        if _ocr_pool is None:
+            # spawn, not fork: we're inside a multithreaded server process
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _ocr_pool
+
+
+def _reset_ocr_pool(pool):
+    """Drop a broken pool so the next call builds a fresh one."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is pool:
+            _ocr_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_ocr_pool():
+    """
+    Stop OCR workers and parse threads (called on app shutdown).
+    Both are recreated on next use, so a later app lifespan in the same process still works.
+    """
+    global _ocr_pool, _parse_executor
+    with _ocr_pool_lock:
+        pool, _ocr_pool = _ocr_pool, None
+        parse_executor, _parse_executor = _parse_executor, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+    if parse_executor is not None:
+        parse_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_queue_depth() -> int:
+    """PDF uploads waiting for a free parse thread."""
+    return _parse_queue.count
+
+
+def ocr_queue_depth() -> int:
+    """OCR pages waiting for a free worker (excludes the ones being processed)."""
+    return max(0, _ocr_outstanding.count - OCR_MAX_WORKERS)
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_get(key):
+    with _ocr_cache_lock:
+        if key in _ocr_cache:
+            _ocr_cache.move_to_end(key)
+            return _ocr_cache[key]
+    return None
+
+
+def _cache_put(key, text: str):
+    with _ocr_cache_lock:
+        _ocr_cache[key] = text
+        _ocr_cache.move_to_end(key)
+        while len(_ocr_cache) > OCR_CACHE_SIZE:
+            _ocr_cache.popitem(last=False)
+
+
+def _ocr_pdf_pages(path: str, page_numbers: list) -> dict:
+    """
+    OCR the given pages across the process pool.
+    Returns {page_number: text} for every page that finished within OCR_TIME_BUDGET_S.
+    Pages are submitted in batches of OCR_MAX_WORKERS and nothing new is submitted
+    once the budget is spent, so at most one batch keeps running past the deadline
+    (its results are still cached for a re-upload). Pages that miss the budget, or
+    a crashed pool, leave the empty text layer in place instead of failing the upload.
+    """
+    pool = _get_ocr_pool()
+    if pool is None:
+        return {}
+
+    digest = _file_digest(path)
+    results = {}
+    pending = []
+    for pno in page_numbers:
+        key = (digest, pno, OCR_DPI, OCR_LANGUAGE)
+        cached = _cache_get(key)
+        if cached is not None:
+            results[pno] = cached
+        else:
+            pending.append((pno, key))
+
+    deadline = time.monotonic() + OCR_TIME_BUDGET_S
+    try:
+        for start in range(0, len(pending), OCR_MAX_WORKERS):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            futures = {}
+            for pno, key in pending[start:start + OCR_MAX_WORKERS]:
+                futures[_submit_ocr(pool, key, path, pno)] = pno
+
+            done, not_done = wait(futures, timeout=remaining)
+            for fut in done:
+                try:
+                    results[futures[fut]] = fut.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    logger.warning("OCR failed for page %s: %s", futures[fut], e)
+            for fut in not_done:
+                fut.cancel()
+    except BrokenProcessPool as e:
+        logger.error("OCR worker pool crashed, recreating it on next use: %s", e)
+        _reset_ocr_pool(pool)
+
+    missing = sum(1 for pno, _ in pending if pno not in results)
+    if missing:
+        logger.warning(
+            "OCR incomplete: %d of %d scanned pages left without text (time budget %.1fs)",
+            missing, len(page_numbers), OCR_TIME_BUDGET_S,
+        )
+
+    return results
+
+
+def _submit_ocr(pool, key, path: str, pno: int):
+    _ocr_outstanding.add(1)
+    try:
+        fut = pool.submit(_ocr_page, path, pno, OCR_DPI, OCR_LANGUAGE, OCR_TESSDATA)
+    except Exception:
+        _ocr_outstanding.add(-1)
+        raise
+    fut.add_done_callback(lambda f, key=key: _ocr_done(key, f))
+    return fut
+
+
+def _ocr_done(key, fut):
+    _ocr_outstanding.add(-1)
+    if fut.cancelled() or fut.exception() is not None:
+        return
+    _cache_put(key, fut.result())
+
+
+def _ocr_page(path: str, pno: int, dpi: int, language: str, tessdata) -> str:
+    # Runs inside a worker process: reopen the document by path
+    with fitz.open(path) as doc:
+        page = doc[pno]
+        tp = page.get_textpage_ocr(**_ocr_kwargs(dpi, language, tessdata))
+        return page.get_text(textpage=tp)
+
+
 def _extract_text_from_docx(path: str) -> str:
     d = docx.Document(path)
     return "\n".join([p.text for p in d.paragraphs if p.text.strip()])
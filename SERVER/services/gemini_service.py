@@ -4,6 +4,8 @@ import google.generativeai as genai
 from dotenv import load_dotenv
 import logging
 
+from services.health import record_gemini_call
+
 load_dotenv()
 
 # Load API Key
@@ -59,7 +61,9 @@ Here is the study text:
     try:
         response = model.generate_content(prompt)
         raw = response.text
+        record_gemini_call(ok=True)
     except Exception as e:
+        record_gemini_call(ok=False)
         logging.exception("Gemini generate_content failed!")
 
         # Helpful debug: list models your API key actually supports
@@ -0,0 +1,154 @@
+# SERVER/services/health.py
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+
+from services import executors, file_parser
+
+logger = logging.getLogger(__name__)
+
+# Readiness thresholds (override via env). Above any of these /readyz reports 503
+# so the load balancer routes new uploads to less loaded instances.
+READY_MAX_LOOP_LAG_MS = float(os.getenv("READY_MAX_LOOP_LAG_MS", "250"))
+READY_MAX_INFLIGHT = int(os.getenv("READY_MAX_INFLIGHT", "8"))
+READY_MAX_QUEUE_DEPTH = int(os.getenv("READY_MAX_QUEUE_DEPTH", "16"))
+READY_MAX_GEMINI_ERROR_RATE = float(os.getenv("READY_MAX_GEMINI_ERROR_RATE", "0.5"))
+
+GEMINI_ERROR_WINDOW_S = float(os.getenv("GEMINI_ERROR_WINDOW_S", "300"))
+# Don't judge the error rate on a handful of calls
+GEMINI_ERROR_MIN_CALLS = int(os.getenv("GEMINI_ERROR_MIN_CALLS", "5"))
+
+LOOP_LAG_INTERVAL_S = 0.5
+# Readiness uses the mean of the last few samples (~3s) so a single GC pause doesn't flap it
+LOOP_LAG_SAMPLES = 6
+
+_lock = Lock()
+_inflight = 0
+_gemini_calls = deque()  # (timestamp, ok)
+_loop_lag_samples = deque(maxlen=LOOP_LAG_SAMPLES)
+_lag_task = None
+
+
+# -----------------------------
+# In-flight upload pipelines
+# -----------------------------
+@contextmanager
+def track_pipeline():
+    global _inflight
+    with _lock:
+        _inflight += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _inflight -= 1
+
+
+# -----------------------------
+# Gemini error rate
+# -----------------------------
+def record_gemini_call(ok: bool):
+    now = time.monotonic()
+    with _lock:
+        _gemini_calls.append((now, ok))
+        _prune_gemini_calls(now)
+
+
+def _prune_gemini_calls(now: float):
+    while _gemini_calls and now - _gemini_calls[0][0] > GEMINI_ERROR_WINDOW_S:
+        _gemini_calls.popleft()
+
+
+def _gemini_stats():
+    with _lock:
+        _prune_gemini_calls(time.monotonic())
+        total = len(_gemini_calls)
+        errors = sum(1 for _, ok in _gemini_calls if not ok)
+    rate = errors / total if total else 0.0
+    return total, errors, rate
+
+
+# -----------------------------
+# Event loop lag
+# -----------------------------
+async def _monitor_loop_lag():
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LOOP_LAG_INTERVAL_S)
+        _loop_lag_samples.append(max(0.0, (loop.time() - start - LOOP_LAG_INTERVAL_S) * 1000))
+
+
+def _loop_lag_stats():
+    """(mean, max) lag in ms over the recent samples, or (None, None) before the first sample."""
+    samples = list(_loop_lag_samples)
+    if not samples:
+        return None, None
+    return sum(samples) / len(samples), max(samples)
+
+
+def start_loop_lag_monitor():
+    """Start the background lag probe on the running loop (safe to call more than once)."""
+    global _lag_task
+    if _lag_task is None or _lag_task.done():
+        _lag_task = asyncio.get_running_loop().create_task(_monitor_loop_lag())
+
+
+def stop_loop_lag_monitor():
+    global _lag_task
+    if _lag_task is not None:
+        _lag_task.cancel()
+        _lag_task = None
+
+
+# -----------------------------
+# Executor queue depth
+# -----------------------------
+def _executor_queue_depth() -> dict:
+    """Work submitted but not yet started, per executor."""
+    return {
+        "parse": file_parser.parse_queue_depth(),
+        "gemini": executors.gemini_queue_depth(),
+        "ocr": file_parser.ocr_queue_depth(),
+    }
+
+
+# -----------------------------
+# Snapshot
+# -----------------------------
+def snapshot() -> dict:
+    """Current load signals plus readiness verdict and the reasons for it."""
+    gemini_total, gemini_errors, gemini_rate = _gemini_stats()
+    queue_depth = _executor_queue_depth()
+    with _lock:
+        inflight = _inflight
+    lag, lag_max = _loop_lag_stats()
+
+    reasons = []
+    if lag is not None and lag > READY_MAX_LOOP_LAG_MS:
+        reasons.append(f"event loop lag {lag:.0f}ms > {READY_MAX_LOOP_LAG_MS:.0f}ms")
+    if inflight > READY_MAX_INFLIGHT:
+        reasons.append(f"in-flight pipelines {inflight} > {READY_MAX_INFLIGHT}")
+    if sum(queue_depth.values()) > READY_MAX_QUEUE_DEPTH:
+        reasons.append(f"executor queue depth {sum(queue_depth.values())} > {READY_MAX_QUEUE_DEPTH}")
+    if gemini_total >= GEMINI_ERROR_MIN_CALLS and gemini_rate > READY_MAX_GEMINI_ERROR_RATE:
+        reasons.append(f"gemini error rate {gemini_rate:.2f} > {READY_MAX_GEMINI_ERROR_RATE:.2f}")
+
+    return {
+        "ready": not reasons,
+        "reasons": reasons,
+        "event_loop_lag_ms": None if lag is None else round(lag, 1),
+        "event_loop_lag_max_ms": None if lag_max is None else round(lag_max, 1),
+        "inflight_pipelines": inflight,
+        "executor_queue_depth": queue_depth,
+        "gemini": {
+            "window_s": GEMINI_ERROR_WINDOW_S,
+            "calls": gemini_total,
+            "errors": gemini_errors,
+            "error_rate": round(gemini_rate, 3),
+        },
+    }
@@ -1,6 +1,7 @@
 # SERVER/services/pdf_builder.py
 from io import BytesIO
 import re
+import tempfile
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -43,16 +44,55 @@ def _split_lines(text: str):
     return text.split("\n")
 
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
 def build_ai_pdf(summary: str, flashcards: list) -> bytes:
     """
     Build a PDF bytes object from summary (markdown-ish) and flashcards list.
     Returns bytes of the generated PDF.
     """
     buffer = BytesIO()
+    _render_ai_pdf(buffer, summary, flashcards)
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
 
+def build_ai_pdf_file(summary: str, flashcards: list):
+    """
+    Render the PDF into an on-disk temp file and return it rewound to the start.
+    The caller owns the file and must close it.
+    ReportLab still assembles the whole PDF as one bytes object before its single
+    write, so this saves the getvalue()/base64 copies, not the render peak.
+    """
+    out = tempfile.TemporaryFile()
+    try:
+        _render_ai_pdf(out, summary, flashcards)
+        out.seek(0)
+    except Exception:
+        out.close()
+        raise
+    return out
+
+
+def iter_file(fh, chunk_size: int = STREAM_CHUNK_SIZE):
+    """Yield `fh` in chunks and close it once exhausted (or the consumer stops)."""
+    try:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        fh.close()
+
+
+def _render_ai_pdf(out, summary: str, flashcards: list):
+    """Lay out summary + flashcards and write the PDF to the file-like `out`."""
     # Setup document
     doc = SimpleDocTemplate(
-        buffer,
+        out,
         pagesize=letter,
         leftMargin=0.75 * inch,
         rightMargin=0.75 * inch,
@@ -186,7 +226,4 @@ def build_ai_pdf(summary: str, flashcards: list) -> bytes:
 
     # Build PDF
     doc.build(flowables)
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
-    return pdf_bytes
 